@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-run overhead of the health sampler in log_my_ip.py.
+
+Behavior:
+- Times collect_health() (sample /proc and /sys, load the previous sample,
+  persist the new one) for a number of iterations against a throwaway
+  STATE_DIR, so your real state is untouched.
+- Prints min/median/p95/max in milliseconds.
+- Exits 1 if the p95 exceeds the budget: --budget-ms, else HEALTH_BUDGET_MS
+  from the INI, else 20 ms.
+
+Usage:
+  ./bench_health.py [--iterations 200] [--budget-ms 20] [--ini /path/to/log-my-ip.ini]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import log_my_ip as lm  # noqa: E402
+
+DEFAULT_BUDGET_MS = 20.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark log_my_ip health sampling overhead")
+    ap.add_argument("--iterations", type=int, default=200, help="Number of timed samples")
+    ap.add_argument("--budget-ms", type=float, default=None, help="Fail if p95 exceeds this many milliseconds")
+    ap.add_argument("--ini", default=None, help="INI to read HEALTH_DISK_PATH/HEALTH_BUDGET_MS from")
+    args = ap.parse_args()
+
+    cfg = lm.parse_ini(lm.resolve_ini_path(args.ini))
+    budget = args.budget_ms
+    if budget is None:
+        budget = float(cfg.get("HEALTH_BUDGET_MS") or DEFAULT_BUDGET_MS)
+
+    with tempfile.TemporaryDirectory(prefix="log-my-ip-bench-") as tmp:
+        cfg = dict(cfg, STATE_DIR=tmp)
+        lm.collect_health(cfg)  # warm up: imports, page cache, first state file
+        times = []
+        for _ in range(max(1, args.iterations)):
+            start = time.perf_counter()
+            lm.collect_health(cfg)
+            times.append((time.perf_counter() - start) * 1000)
+
+    times.sort()
+    p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+    print(f"collect_health x{len(times)}: min={times[0]:.3f}ms median={times[len(times) // 2]:.3f}ms "
+          f"p95={p95:.3f}ms max={times[-1]:.3f}ms (budget {budget:g}ms)")
+    if p95 > budget:
+        print(f"FAIL: p95 {p95:.3f}ms is over the {budget:g}ms budget", file=sys.stderr)
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Fleet load generator for log_my_ip.py.
+
+Runs many simulated hosts through log_my_ip.run_pipeline() against local stub
+Discord and Telegram servers, to size a webhook relay and see how the fleet
+behaves under the destinations' rate limits before rolling out more devices.
+
+Behavior:
+- Each simulated host gets a synthetic hostname, internal/external IP, OS
+  (/etc/os-release), kernel and uptime. These are injected in place of the
+  real run()/which()/read_file() calls, keyed on a contextvar so hosts can
+  share one process.
+- Hosts fire on compressed "cron ticks": everyone is due at the top of the
+  tick and starts after a small cron skew, plus an optional share of REBOOT
+  runs spread across the tick.
+- --jitter-window N applies the --scheduled slot: each SCHEDULED run is
+  delayed by lm.schedule_offset(hostname, N), with the window compressed to
+  fit the tick when N is longer than --tick-interval.
+- The stubs enforce a sliding-window rate limit per Discord webhook and per
+  Telegram bot and answer 429 like the real services.
+- --edit-in-place turns on STATUS_EDIT_IN_PLACE, so SCHEDULED runs after the
+  first edit their status message (stub PATCH / editMessageText routes).
+- Reports runs/s, failed runs (drops), stub-side 429s and run latency
+  percentiles measured from each run's scheduled start.
+
+Usage:
+  ./fleet_loadgen.py --hosts 2000 --ticks 3 --tick-interval 20 --concurrency 200
+  ./fleet_loadgen.py --hosts 5000 --processes 4 --webhooks 10 --json
+  ./fleet_loadgen.py --hosts 2000 --tick-interval 20 --jitter-window 600
+"""
+import argparse
+import contextlib
+import contextvars
+import hashlib
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import log_my_ip as lm  # noqa: E402
+
+OS_RELEASES = [
+    ('debian', 'Raspbian GNU/Linux 11 (bullseye)', 'ID=raspbian\nID_LIKE=debian\nPRETTY_NAME="Raspbian GNU/Linux 11 (bullseye)"\n'),
+    ('debian', 'Debian GNU/Linux 12 (bookworm)', 'ID=debian\nPRETTY_NAME="Debian GNU/Linux 12 (bookworm)"\n'),
+    ('ubuntu', 'Ubuntu 22.04.4 LTS', 'ID=ubuntu\nID_LIKE=debian\nPRETTY_NAME="Ubuntu 22.04.4 LTS"\n'),
+    ('fedora', 'Fedora Linux 40', 'ID=fedora\nPRETTY_NAME="Fedora Linux 40 (Server Edition)"\n'),
+]
+KERNELS = ["6.1.0-rpi7-rpi-v8", "6.6.31+rpt-rpi-v8", "6.1.0-21-arm64", "5.15.0-1053-raspi"]
+
+_current_host: contextvars.ContextVar = contextvars.ContextVar("fleet_loadgen_host", default=None)
+
+
+# ---------------------------------------------------------------------------
+# Simulated hosts
+# ---------------------------------------------------------------------------
+
+def make_host(index: int, seed: int) -> Dict[str, str]:
+    """Deterministic synthetic facts for host number `index`."""
+    rnd = random.Random(seed * 1_000_003 + index)
+    _, _, os_release = OS_RELEASES[rnd.randrange(len(OS_RELEASES))]
+    return {
+        "hostname": f"pi-{index:05d}",
+        "intip": f"10.{(index >> 16) & 0xFF}.{(index >> 8) & 0xFF}.{index & 0xFF or 1}",
+        "extip": f"{rnd.choice(['198.51.100', '203.0.113'])}.{rnd.randrange(1, 255)}",
+        "os_release": os_release,
+        "kernel": rnd.choice(KERNELS),
+        "uptime": f"up {rnd.randrange(1, 90)} days, {rnd.randrange(0, 24)} hours",
+    }
+
+
+def _fake_run(orig):
+    def run(cmd, cwd=None, quiet=True):
+        host = _current_host.get()
+        if host is None:
+            return orig(cmd, cwd=cwd, quiet=quiet)
+        joined = " ".join(cmd)
+        if cmd[:1] == ["hostname"]:
+            return host["hostname"]
+        if "hostname -I" in joined:
+            return host["intip"]
+        if cmd[:1] == ["dig"]:
+            return f'"{host["extip"]}"' if "TXT" in cmd else host["extip"]
+        if cmd[:2] == ["uname", "-r"]:
+            return host["kernel"]
+        if "uptime -p" in joined:
+            return host["uptime"]
+        return ""
+    return run
+
+
+def _fake_which(orig):
+    def which(cmd):
+        if _current_host.get() is None:
+            return orig(cmd)
+        # dig answers from the host facts; no lsb_release, no git (so no self-update).
+        return cmd == "dig"
+    return which
+
+
+def _fake_read_file(orig):
+    def read_file(path):
+        host = _current_host.get()
+        if host is None:
+            return orig(path)
+        if path == "/etc/os-release":
+            return host["os_release"]
+        if path.startswith(("/proc/", "/sys/", "/etc/")):
+            return None
+        return orig(path)  # state files (STATE_DIR) are real
+    return read_file
+
+
+def install_fakes() -> None:
+    lm.run = _fake_run(lm.run)
+    lm.which = _fake_which(lm.which)
+    lm.read_file = _fake_read_file(lm.read_file)
+
+
+# ---------------------------------------------------------------------------
+# Stub Discord / Telegram server
+# ---------------------------------------------------------------------------
+
+class _SlidingWindow:
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.hits: Dict[str, deque] = {}
+        self.lock = threading.Lock()
+
+    def check(self, key: str) -> float:
+        """Record a hit for key; return 0 if allowed, else seconds until a slot frees up."""
+        now = time.monotonic()
+        with self.lock:
+            q = self.hits.setdefault(key, deque())
+            while q and now - q[0] >= self.window:
+                q.popleft()
+            if self.limit > 0 and len(q) >= self.limit:
+                return max(0.001, self.window - (now - q[0]))
+            q.append(now)
+            return 0.0
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, opts):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.latency = opts.stub_latency_ms / 1000.0
+        self.discord_rl = _SlidingWindow(opts.discord_limit, opts.discord_window)
+        self.telegram_rl = _SlidingWindow(opts.telegram_limit, opts.telegram_window)
+        self.stats = {"discord_ok": 0, "discord_edit": 0, "discord_429": 0,
+                      "telegram_ok": 0, "telegram_edit": 0, "telegram_429": 0, "other": 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, key: str) -> None:
+        with self.stats_lock:
+            self.stats[key] += 1
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _reply(self, code: int, body: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_PATCH(self):
+        self.do_POST()
+
+    def do_POST(self):
+        srv: StubServer = self.server
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if srv.latency:
+            time.sleep(random.uniform(0.5, 1.5) * srv.latency)
+        path = self.path.split("?", 1)[0]
+        m = re.match(r"^/api/webhooks/([^/]+)/[^/]+(/messages/(\d+))?$", path)
+        if m:
+            wait = srv.discord_rl.check(m.group(1))
+            if wait:
+                srv.count("discord_429")
+                self._reply(429, {"message": "You are being rate limited.", "retry_after": round(wait, 3), "global": False},
+                            {"Retry-After": str(int(wait) + 1), "X-RateLimit-Remaining": "0"})
+                return
+            if self.command == "PATCH" and m.group(3):
+                srv.count("discord_edit")
+                self._reply(200, {"id": m.group(3)})
+                return
+            srv.count("discord_ok")
+            if "wait=true" in self.path:
+                self._reply(200, {"id": str(random.getrandbits(62))})
+            else:
+                self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            return
+        m = re.match(r"^/bot([^/]+)/(sendMessage|editMessageText)$", path)
+        if m:
+            wait = srv.telegram_rl.check(m.group(1))
+            if wait:
+                srv.count("telegram_429")
+                retry = int(wait) + 1
+                self._reply(429, {"ok": False, "error_code": 429, "description": f"Too Many Requests: retry after {retry}",
+                                  "parameters": {"retry_after": retry}})
+                return
+            if m.group(2) == "editMessageText":
+                srv.count("telegram_edit")
+                self._reply(200, {"ok": True, "result": True})
+                return
+            srv.count("telegram_ok")
+            self._reply(200, {"ok": True, "result": {"message_id": random.getrandbits(31)}})
+            return
+        srv.count("other")
+        self._reply(404, {"message": "Unknown route"})
+
+
+# ---------------------------------------------------------------------------
+# Driving the fleet
+# ---------------------------------------------------------------------------
+
+def _slot(opts, index: int) -> float:
+    """This host's --scheduled slot within the tick, from the same hash log_my_ip uses."""
+    if opts.jitter_window <= 0:
+        return 0.0
+    offset = lm.schedule_offset(make_host(index, opts.seed)["hostname"], opts.jitter_window)
+    return offset * min(1.0, opts.tick_interval / opts.jitter_window)
+
+
+def _schedule(opts, indices: List[int]) -> List[tuple]:
+    """(offset_seconds, host_index, note) for every run, relative to the first tick."""
+    rnd = random.Random(opts.seed)
+    slots = {i: _slot(opts, i) for i in indices}
+    events = []
+    for tick in range(opts.ticks):
+        base = tick * opts.tick_interval
+        for i in indices:
+            if rnd.random() < opts.reboot_fraction:
+                events.append((base + rnd.uniform(0, opts.tick_interval), i, "REBOOT"))
+            else:
+                # cron starts jobs a little after the minute; most land in the first second
+                skew = min(rnd.expovariate(1.0 / opts.cron_skew), 5.0) if opts.cron_skew > 0 else 0.0
+                events.append((base + skew + slots[i], i, "SCHEDULED"))
+    events.sort()
+    return events
+
+
+def _host_cfg(opts, base_url: str, host: Dict[str, str]) -> Dict[str, str]:
+    bucket = int(hashlib.sha1(host["hostname"].encode()).hexdigest(), 16) % max(1, opts.webhooks)
+    # No health sampling: it would read this machine's /proc and share one state file
+    cfg = {"_my_network_range": "ANY", "USE_SELFUPATE": "NO", "REPORT_HEALTH": "NO"}
+    if opts.destinations in ("discord", "both"):
+        cfg.update({"ENABLE_DISCORD": "YES", "DISCORD_WEBHOOK_URL": f"{base_url}/api/webhooks/{bucket}/stubtoken"})
+    else:
+        cfg["ENABLE_DISCORD"] = "NO"
+    if opts.destinations in ("telegram", "both"):
+        cfg.update({"ENABLE_TELEGRAM": "YES", "TGTOKEN": "123:stub", "TGGRPID": "-100", "TELEGRAM_API_URL": base_url})
+    else:
+        cfg["ENABLE_TELEGRAM"] = "NO"
+    if opts.edit_in_place:
+        # One state dir per shard (hosts are sharded by index % processes), so processes don't share files
+        shard = int(host["hostname"].split("-")[1]) % max(1, opts.processes)
+        cfg.update({"STATUS_EDIT_IN_PLACE": "YES", "STATE_DIR": os.path.join(opts.state_dir, f"shard-{shard}")})
+    return cfg
+
+
+def _run_one(opts, base_url: str, index: int, note: str) -> int:
+    host = make_host(index, opts.seed)
+    _current_host.set(host)
+    cfg = _host_cfg(opts, base_url, host)
+    args = SimpleNamespace(note=note, reboot=note == "REBOOT", dry_run=False, stats=False, original_argv=[])
+    return lm.run_pipeline(cfg, args, "<fleet_loadgen>", host["hostname"])
+
+
+def run_shard(opts, base_url: str, indices: List[int], t0: float) -> dict:
+    """Run every scheduled event for `indices`; t0 is the wall-clock time of the first tick."""
+    install_fakes()
+    latencies: List[float] = []
+    failures = 0
+    lock = threading.Lock()
+
+    def fire(at: float, index: int, note: str) -> None:
+        nonlocal failures
+        try:
+            rc = contextvars.Context().run(_run_one, opts, base_url, index, note)
+        except Exception:
+            rc = -1
+        done = time.time()
+        with lock:
+            latencies.append(done - at)
+            if rc != 0:
+                failures += 1
+
+    sink = sys.stderr if opts.verbose else io.StringIO()
+    with contextlib.redirect_stderr(sink), ThreadPoolExecutor(max_workers=opts.concurrency) as pool:
+        for offset, index, note in _schedule(opts, indices):
+            at = t0 + offset
+            delay = at - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, at, index, note)
+    return {"latencies": latencies, "failures": failures}
+
+
+def _pct(sorted_vals: List[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = min(len(sorted_vals) - 1, max(0, int(round(p / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Simulate a fleet of log_my_ip hosts against local stub endpoints")
+    ap.add_argument("--hosts", type=int, default=1000, help="Number of simulated hosts")
+    ap.add_argument("--ticks", type=int, default=1, help="Number of cron ticks to simulate")
+    ap.add_argument("--tick-interval", type=float, default=10.0, help="Seconds between simulated cron ticks")
+    ap.add_argument("--cron-skew", type=float, default=0.5, help="Mean cron start delay in seconds (0 = all at once)")
+    ap.add_argument("--reboot-fraction", type=float, default=0.0, help="Share of runs that are REBOOTs spread over the tick")
+    ap.add_argument("--concurrency", type=int, default=100, help="Concurrent runs per process")
+    ap.add_argument("--processes", type=int, default=1, help="Split hosts across this many worker processes")
+    ap.add_argument("--destinations", choices=["discord", "telegram", "both"], default="both")
+    ap.add_argument("--webhooks", type=int, default=1, help="Distinct Discord webhooks the fleet is spread across")
+    ap.add_argument("--stub-latency-ms", type=float, default=50.0, help="Mean stub response latency")
+    ap.add_argument("--discord-limit", type=int, default=5, help="Requests per window per webhook (0 = unlimited)")
+    ap.add_argument("--discord-window", type=float, default=2.0, help="Discord rate-limit window in seconds")
+    ap.add_argument("--telegram-limit", type=int, default=30, help="Requests per window per bot (0 = unlimited)")
+    ap.add_argument("--telegram-window", type=float, default=1.0, help="Telegram rate-limit window in seconds")
+    ap.add_argument("--jitter-window", type=float, default=0.0,
+                    help="Simulate SCHEDULE_JITTER_WINDOW: delay SCHEDULED runs to each host's slot, "
+                         "compressed to fit --tick-interval (0 = everyone at the top of the tick)")
+    ap.add_argument("--edit-in-place", action="store_true", help="Simulate STATUS_EDIT_IN_PLACE=YES")
+    ap.add_argument("--seed", type=int, default=1, help="Seed for host facts and schedule")
+    ap.add_argument("--json", action="store_true", help="Print the report as JSON")
+    ap.add_argument("-v", "--verbose", action="store_true", help="Keep per-send error output")
+    return ap.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    opts = parse_args(argv)
+    state_tmp = tempfile.TemporaryDirectory(prefix="fleet-loadgen-")
+    opts.state_dir = state_tmp.name
+    server = StubServer(opts)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    shards = [list(range(i, opts.hosts, opts.processes)) for i in range(max(1, opts.processes))]
+    t0 = time.time() + 0.5
+    started = time.time()
+    if opts.processes > 1:
+        with ProcessPoolExecutor(max_workers=opts.processes) as pool:
+            results = list(pool.map(run_shard, [opts] * len(shards), [server.base_url] * len(shards), shards,
+                                    [t0] * len(shards)))
+    else:
+        results = [run_shard(opts, server.base_url, shards[0], t0)]
+    elapsed = time.time() - started
+    server.shutdown()
+    state_tmp.cleanup()
+
+    lat = sorted(x for r in results for x in r["latencies"])
+    runs = len(lat)
+    report = {
+        "hosts": opts.hosts,
+        "runs": runs,
+        "failed_runs": sum(r["failures"] for r in results),
+        "elapsed_s": round(elapsed, 3),
+        "runs_per_s": round(runs / elapsed, 2) if elapsed else 0.0,
+        "latency_s": {p: round(_pct(lat, float(p[1:])), 4) for p in ("p50", "p90", "p99", "p99.9")},
+        "latency_max_s": round(lat[-1], 4) if lat else 0.0,
+        "stub": dict(server.stats),
+    }
+    if opts.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"Hosts: {report['hosts']}  runs: {runs}  failed: {report['failed_runs']}  elapsed: {report['elapsed_s']}s")
+    print(f"Throughput: {report['runs_per_s']} runs/s")
+    print("Latency: " + "  ".join(f"{k}={v}s" for k, v in report["latency_s"].items()) + f"  max={report['latency_max_s']}s")
+    print("Stub: " + "  ".join(f"{k}={v}" for k, v in report["stub"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,25 +8,41 @@ Unified Python script to send system IP info to Discord and/or Telegram.
     3) /usr/local/etc/log-my-ip.ini
     Override with --ini /path/to/file
 - ENABLE_DISCORD/ENABLE_TELEGRAM control destinations (inferred if missing)
+- Extra sinks: more Discord webhooks, generic JSON webhook, syslog, JSONL file;
+  each sink sends from its own worker thread, with a deadline (SINK_TIMEOUT)
 - --reboot skips self-update; --scheduled sets note; -m/--note allows custom
+- --scheduled and --daemon report at a stable per-host offset (hash of hostname) inside
+  SCHEDULE_JITTER_WINDOW; a token bucket caps runaway HTTP request loops (HTTP_RATE/HTTP_BURST)
 - Waits for internal IP with ANY/timeout behavior; resolves external IP robustly
 - Self-update from git (USE_SELFUPATE=YES, GIT_BRANCH=main), skips if no DNS
+- Independent phases (update check, IP wait, external IP, host facts) run concurrently
+- STATUS_EDIT_IN_PLACE=YES keeps one Discord/Telegram status message per host and edits it;
+  REBOOT and explicit notes still post new messages
+- DNS answers for destination hosts are cached on disk between runs (DNS_CACHE=NO to turn off)
+- Health: CPU temp, load, memory, disk and Pi throttle flags from /proc and /sys,
+  with deltas against the last report (REPORT_HEALTH=NO to turn off)
 """
 import argparse
+import contextvars
+import hashlib
 import json
 import os
+import queue
 import re
 import shutil
 import socket
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 from urllib import request, parse
 from urllib import error as urlerror
 
 INI_PATH_DEFAULT = "/usr/local/etc/log-my-ip.ini"
+STATE_DIR_DEFAULT = "/var/lib/log-my-ip"
 
 def resolve_ini_path(cli_path: Optional[str]) -> str:
     """Resolve the INI path using CLI override or common locations.
@@ -85,6 +101,7 @@ def patch_ini(ini_path: str, dry_run: bool = False) -> int:
         "TGTOKEN": '""',
         "TGCHATID": '""',
         "TGGRPID": '""',
+        "TELEGRAM_API_URL": None,
         "ENABLE_TELEGRAM": None,
         # Discord
         "DISCORD_WEBHOOK_URL": '""',
@@ -95,7 +112,33 @@ def patch_ini(ini_path: str, dry_run: bool = False) -> int:
         "DISCORD_OS_LOGO_CODE": None,
         "DISCORD_THREAD_ID": None,
         "DISCORD_WAIT": None,
+        "DISCORD_EXTRA_WEBHOOK_URLS": None,
         "ENABLE_DISCORD": None,
+        "STATUS_EDIT_IN_PLACE": None,
+        # Other sinks
+        "WEBHOOK_URL": None,
+        "WEBHOOK_AUTH_HEADER": None,
+        "ENABLE_WEBHOOK": None,
+        "ENABLE_SYSLOG": None,
+        "SYSLOG_FACILITY": None,
+        "JSONL_PATH": None,
+        "ENABLE_JSONL": None,
+        "SINK_TIMEOUT": None,
+        # State and health
+        "STATE_DIR": None,
+        "REPORT_HEALTH": None,
+        "HEALTH_DISK_PATH": None,
+        "HEALTH_BUDGET_MS": None,
+        # DNS cache
+        "DNS_CACHE": None,
+        "DNS_CACHE_TTL": None,
+        "DNS_CACHE_STALE": None,
+        "DNS_CACHE_NEGATIVE_TTL": None,
+        # Scheduling
+        "SCHEDULE_JITTER_WINDOW": None,
+        "SCHEDULE_INTERVAL": None,
+        "HTTP_RATE": None,
+        "HTTP_BURST": None,
     }
     missing_lines = []
     for key, val in defaults.items():
@@ -155,6 +198,70 @@ def write_file(path, data, mode=0o644):
         f.write(data)
     os.chmod(path, mode)
 
+def state_dir(cfg):
+    """Directory for state kept between runs: STATE_DIR, else /var/lib/log-my-ip,
+    else ~/.cache/log-my-ip when not running as root."""
+    configured = (cfg.get("STATE_DIR") or "").strip()
+    if configured:
+        return os.path.expanduser(configured)
+    for d in (STATE_DIR_DEFAULT, os.path.join(os.path.expanduser("~"), ".cache", "log-my-ip")):
+        try:
+            os.makedirs(d, exist_ok=True)
+            if os.access(d, os.W_OK):
+                return d
+        except OSError:
+            continue
+    return STATE_DIR_DEFAULT
+
+def load_state(cfg, name):
+    """Load a JSON state file from state_dir(); {} if missing or unreadable."""
+    try:
+        data = json.loads(read_file(os.path.join(state_dir(cfg), name)) or "{}")
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_state(cfg, name, data):
+    """Atomically replace a JSON state file; best effort, warns on failure."""
+    path = os.path.join(state_dir(cfg), name)
+    tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Warning: could not save state {path}: {e}", file=sys.stderr)
+
+_state_lock = threading.Lock()
+
+def update_state(cfg, name, fn):
+    """Read-modify-write a JSON state file; fn mutates the dict. Serialized across threads."""
+    with _state_lock:
+        data = load_state(cfg, name)
+        fn(data)
+        save_state(cfg, name, data)
+
+STATUS_STATE_FILE = "messages.json"
+
+def status_edit_enabled(cfg):
+    return str(cfg.get("STATUS_EDIT_IN_PLACE", "NO")).strip().upper() == "YES"
+
+def status_message_key(kind, hostname, target):
+    """State key for a host's status message; target (webhook URL, bot token) is hashed, not stored."""
+    return f"{kind}:{hostname}:{hashlib.sha256(target.encode()).hexdigest()[:16]}"
+
+def get_status_message_id(cfg, key):
+    return load_state(cfg, STATUS_STATE_FILE).get(key)
+
+def set_status_message_id(cfg, key, msg_id):
+    def apply(d):
+        if msg_id:
+            d[key] = str(msg_id)
+        else:
+            d.pop(key, None)
+    update_state(cfg, STATUS_STATE_FILE, apply)
+
 def parse_ini(path):
     cfg = {}
     text = read_file(path)
@@ -180,7 +287,7 @@ def ensure_ini_enable_flags(cfg):
     if "ENABLE_DISCORD" in cfg:
         enable_discord = is_yes(cfg.get("ENABLE_DISCORD"))
     else:
-        enable_discord = bool(cfg.get("DISCORD_WEBHOOK_URL"))
+        enable_discord = bool(cfg.get("DISCORD_WEBHOOK_URL") or _split_list(cfg.get("DISCORD_EXTRA_WEBHOOK_URLS")))
     if "ENABLE_TELEGRAM" in cfg:
         enable_telegram = is_yes(cfg.get("ENABLE_TELEGRAM"))
     else:
@@ -188,7 +295,8 @@ def ensure_ini_enable_flags(cfg):
         enable_telegram = bool(t and (cfg.get("TGGRPID") or cfg.get("TGCHATID")))
     return enable_discord, enable_telegram
 
-def wait_for_internal_ip(network_range, max_attempts=24, sleep_sec=5):
+def wait_for_internal_ip(network_range, max_attempts=24, sleep_sec=5, not_ready=None):
+    """Poll `hostname -I` until it has a (matching) address; sets the `not_ready` Event if it had to wait."""
     require_match = not (not network_range or str(network_range).strip().upper() == "ANY")
     attempts = 0
     while True:
@@ -198,6 +306,8 @@ def wait_for_internal_ip(network_range, max_attempts=24, sleep_sec=5):
             if not require_match or (network_range in ip):
                 return ip
         attempts += 1
+        if not_ready is not None:
+            not_ready.set()
         if attempts >= max_attempts:
             return ip
         time.sleep(sleep_sec)
@@ -261,6 +371,137 @@ def _read_os_release() -> dict:
         info[k.strip()] = v
     return info
 
+THERMAL_PATH = "/sys/class/thermal/thermal_zone0/temp"
+THROTTLED_PATH = "/sys/devices/platform/soc/soc:firmware/get_throttled"
+# get_throttled bits: 0-3 are "now", 16-19 the same conditions "since boot"
+THROTTLE_BITS = {
+    0: "under-voltage",
+    1: "freq capped",
+    2: "throttled",
+    3: "soft temp limit",
+}
+
+def _read_quiet(path):
+    try:
+        return read_file(path)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def sample_health(disk_path="/"):
+    """One cheap sample of host health: each file is read once, no subprocesses.
+
+    Keys are only present when the source exists (e.g. throttled is Pi-only).
+    """
+    start = time.perf_counter()
+    s = {"ts": round(time.time(), 3)}
+    txt = _read_quiet(THERMAL_PATH)
+    if txt and txt.strip().lstrip("-").isdigit():
+        s["temp_c"] = round(int(txt) / 1000.0, 1)
+    txt = _read_quiet("/proc/loadavg")
+    if txt:
+        parts = txt.split()
+        if len(parts) >= 3:
+            s["load"] = [float(x) for x in parts[:3]]
+    txt = _read_quiet("/proc/meminfo")
+    if txt:
+        mem = {}
+        for line in txt.splitlines():
+            k, _, rest = line.partition(":")
+            if k in ("MemTotal", "MemAvailable"):
+                mem[k] = int(rest.split()[0]) * 1024
+                if len(mem) == 2:
+                    break
+        if len(mem) == 2:
+            s["mem_total"] = mem["MemTotal"]
+            s["mem_used"] = mem["MemTotal"] - mem["MemAvailable"]
+    try:
+        st = os.statvfs(disk_path)
+        s["disk_path"] = disk_path
+        s["disk_total"] = st.f_blocks * st.f_frsize
+        s["disk_used"] = (st.f_blocks - st.f_bfree) * st.f_frsize
+    except OSError:
+        pass
+    txt = _read_quiet(THROTTLED_PATH)
+    if txt:
+        try:
+            s["throttled"] = int(txt.strip(), 16)
+        except ValueError:
+            pass
+    s["sample_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return s
+
+def health_deltas(cur, prev):
+    """Changes since the previous persisted sample (missing keys are skipped)."""
+    d = {}
+    if not prev:
+        return d
+    if "ts" in prev:
+        d["interval_s"] = round(cur["ts"] - prev["ts"])
+    for key in ("temp_c", "disk_used", "mem_used"):
+        if key in cur and key in prev:
+            d[key] = round(cur[key] - prev[key], 1)
+    if "throttled" in cur:
+        # Only the sticky "since boot" bits can be compared meaningfully across runs
+        d["throttled_new"] = (cur["throttled"] >> 16) & ~(prev.get("throttled", 0) >> 16) & 0xF
+    return d
+
+def collect_health(cfg, persist=True):
+    """Sample health, attach deltas vs the last persisted sample and (optionally) persist it."""
+    cur = sample_health((cfg.get("HEALTH_DISK_PATH") or "/").strip() or "/")
+    prev = load_state(cfg, "health.json")
+    if persist:
+        save_health(cfg, cur)
+    cur["delta"] = health_deltas(cur, prev)
+    return cur
+
+def save_health(cfg, sample):
+    """Make `sample` the baseline for the next report's deltas."""
+    save_state(cfg, "health.json", {k: v for k, v in sample.items() if k != "delta"})
+
+def _fmt_bytes(n):
+    n = float(n)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit in ("B", "KB") else f"{n:.1f} {unit}"
+        n /= 1024.0
+
+def _describe_throttle(bits):
+    return ", ".join(name for bit, name in THROTTLE_BITS.items() if bits & (1 << bit))
+
+def health_fields(h):
+    """Human-readable (name, value) pairs for the Discord embed and Telegram text."""
+    if not h:
+        return []
+    d = h.get("delta", {})
+    out = []
+    if "temp_c" in h:
+        val = f"{h['temp_c']:.1f}°C"
+        if "temp_c" in d:
+            val += f" ({d['temp_c']:+.1f})"
+        out.append(("CPU Temp", val))
+    if "load" in h:
+        out.append(("Load", " ".join(f"{x:.2f}" for x in h["load"])))
+    if "mem_total" in h:
+        pct = h["mem_used"] * 100 // max(1, h["mem_total"])
+        out.append(("Memory", f"{_fmt_bytes(h['mem_used'])} / {_fmt_bytes(h['mem_total'])} ({pct}%)"))
+    if "disk_total" in h:
+        pct = h["disk_used"] * 100 // max(1, h["disk_total"])
+        val = f"{_fmt_bytes(h['disk_used'])} / {_fmt_bytes(h['disk_total'])} ({pct}%)"
+        if d.get("disk_used"):
+            val += f", {'+' if d['disk_used'] > 0 else '-'}{_fmt_bytes(abs(d['disk_used']))}"
+        out.append((f"Disk {h['disk_path']}", val))
+    if "throttled" in h:
+        now = _describe_throttle(h["throttled"])
+        since = _describe_throttle(h["throttled"] >> 16)
+        if not (now or since):
+            val = "OK"
+        else:
+            val = "; ".join(p for p in (f"now: {now}" if now else "", f"since boot: {since}" if since else "") if p)
+            if d.get("throttled_new"):
+                val += f" (new: {_describe_throttle(d['throttled_new'])})"
+        out.append(("Throttle", val))
+    return out
+
 def get_os_logo_url(cfg: dict, os_name: str) -> str:
     """Return a logo URL using a short code derived from /etc/os-release or INI override.
 
@@ -380,15 +621,65 @@ def get_os_logo_url(cfg: dict, os_name: str) -> str:
             return f"https://raw.githubusercontent.com/M1XZG/operating-system-logos/master/src/128x128/{val}.png"
     return ""
 
-def send_discord(cfg, note, hostname, intip, extip, os_name, kernel, uptime, dry_run=False):
-    url = (cfg.get("DISCORD_WEBHOOK_URL", "") or "").strip()
+# Outcomes of an edit-in-place attempt
+EDITED, EDIT_GONE, EDIT_FAILED = "edited", "gone", "failed"
+
+def _discord_edit(base_url, thread_id, msg_id, payload):
+    """PATCH an existing webhook message. Returns EDITED, EDIT_GONE if Discord no longer
+    knows the message (post a new one), or EDIT_FAILED for anything else (keep the ID)."""
+    url = f"{base_url.split('?', 1)[0].rstrip('/')}/messages/{msg_id}"
+    if thread_id:
+        url += f"?thread_id={parse.quote(thread_id)}"
+    # username/avatar_url can't be changed on edit
+    body = {k: v for k, v in payload.items() if k in ("content", "embeds")}
+    try:
+        req = request.Request(
+            url,
+            data=json.dumps(body).encode(),
+            method="PATCH",
+            headers={
+                "Content-Type": "application/json",
+                "User-Agent": "pi-ip-logger/1.0 (+https://github.com/M1XZG/pi-ip-logging)",
+            },
+        )
+        with request.urlopen(req, timeout=5) as _:
+            pass
+        return EDITED
+    except urlerror.HTTPError as e:
+        try:
+            code = json.loads(e.read().decode(errors="ignore") or "{}").get("code")
+        except (ValueError, AttributeError):
+            code = None
+        if e.code == 404 and code == 10008:  # Unknown Message
+            print("Discord status message is gone (deleted?), posting a new one", file=sys.stderr)
+            return EDIT_GONE
+        print(f"Discord edit failed: {e}", file=sys.stderr)
+        return EDIT_FAILED
+    except Exception as e:
+        print(f"Discord edit failed: {e}", file=sys.stderr)
+        return EDIT_FAILED
+
+def _discord_message_id(resp_body):
+    try:
+        return str(json.loads(resp_body.decode() or "{}").get("id") or "")
+    except (ValueError, AttributeError):
+        return ""
+
+def send_discord(cfg, note, hostname, intip, extip, os_name, kernel, uptime, dry_run=False, url=None, extra_fields=None,
+                 status=False):
+    """Post the report to a webhook. With status=True (and STATUS_EDIT_IN_PLACE=YES at the
+    caller), edit this host's stored status message instead, posting a new one if there is none."""
+    url = (url or cfg.get("DISCORD_WEBHOOK_URL", "") or "").strip()
     if not url:
         print("Error: DISCORD_WEBHOOK_URL is not configured. Set it in /usr/local/etc/log-my-ip.ini", file=sys.stderr)
         return False
+    base_url = url
     # Optional: if posting into a thread (e.g., Forum channel), Discord requires thread_id in query
     thread_id = (cfg.get("DISCORD_THREAD_ID") or "").strip()
-    # Optional: add wait=true to get response data from Discord (can help with proxies/WAF)
-    add_wait = str(cfg.get("DISCORD_WAIT", "")).strip().upper() == "YES"
+    edit_key = status_message_key("discord", hostname, f"{base_url}#{thread_id}") if status else None
+    # Optional: add wait=true to get response data from Discord (can help with proxies/WAF).
+    # Always on when editing in place: the response carries the message ID to store.
+    add_wait = str(cfg.get("DISCORD_WAIT", "")).strip().upper() == "YES" or bool(edit_key)
     if thread_id or add_wait:
         try:
             parts = parse.urlparse(url)
@@ -431,7 +722,7 @@ def send_discord(cfg, note, hostname, intip, extip, os_name, kernel, uptime, dry
                         {"name": "OS", "value": os_name, "inline": True},
                         {"name": "Kernel", "value": kernel, "inline": True},
                         {"name": "Uptime", "value": uptime, "inline": True},
-                    ],
+                    ] + [{"name": k, "value": v, "inline": True} for k, v in (extra_fields or [])],
                 }
             ],
         }
@@ -439,9 +730,18 @@ def send_discord(cfg, note, hostname, intip, extip, os_name, kernel, uptime, dry
         content = f"System Update: {note}\nHostname: {hostname}\nInternal IP: {intip}\nExternal IP: {extip}"
         payload = {"username": username, "avatar_url": avatar, "content": content}
     data = json.dumps(payload).encode()
+    msg_id = get_status_message_id(cfg, edit_key) if edit_key else None
     if dry_run:
-        print("[DRY RUN] Discord payload:", json.dumps(payload))
+        if msg_id:
+            print(f"[DRY RUN] Discord edit of message {msg_id}:", json.dumps(payload))
+        else:
+            print("[DRY RUN] Discord payload:", json.dumps(payload))
         return True
+    if msg_id:
+        outcome = _discord_edit(base_url, thread_id, msg_id, payload)
+        if outcome != EDIT_GONE:
+            return outcome == EDITED
+        set_status_message_id(cfg, edit_key, None)
     try:
         req = request.Request(
             url,
@@ -451,8 +751,10 @@ def send_discord(cfg, note, hostname, intip, extip, os_name, kernel, uptime, dry
                 "User-Agent": "pi-ip-logger/1.0 (+https://github.com/M1XZG/pi-ip-logging)",
             },
         )
-        with request.urlopen(req, timeout=5) as _:
-            pass
+        with request.urlopen(req, timeout=5) as resp:
+            resp_body = resp.read()
+        if edit_key:
+            set_status_message_id(cfg, edit_key, _discord_message_id(resp_body))
         return True
     except urlerror.HTTPError as e:
         body = None
@@ -480,8 +782,10 @@ def send_discord(cfg, note, hostname, intip, extip, os_name, kernel, uptime, dry
                         "User-Agent": "pi-ip-logger/1.0 (+https://github.com/M1XZG/pi-ip-logging)",
                     },
                 )
-                with request.urlopen(req2, timeout=5) as _:
-                    pass
+                with request.urlopen(req2, timeout=5) as resp2:
+                    resp_body = resp2.read()
+                if edit_key:
+                    set_status_message_id(cfg, edit_key, _discord_message_id(resp_body))
                 return True
             except Exception as e2:
                 print(f"Discord fallback (content-only) failed: {e2}", file=sys.stderr)
@@ -490,7 +794,40 @@ def send_discord(cfg, note, hostname, intip, extip, os_name, kernel, uptime, dry
         print(f"Discord send failed: {e}", file=sys.stderr)
         return False
 
-def send_telegram(cfg, note, hostname, intip, extip, dry_run=False):
+def telegram_api_url(cfg, token, method):
+    """Bot API endpoint; TELEGRAM_API_URL points it at a local Bot API server or a test stub."""
+    base = (cfg.get("TELEGRAM_API_URL") or "https://api.telegram.org").strip().rstrip("/")
+    return f"{base}/bot{token}/{method}"
+
+def _telegram_edit(cfg, token, chat, msg_id, text):
+    """editMessageText on a stored status message. EDITED if edited (or unchanged), EDIT_GONE
+    if Telegram can't find it (post anew), EDIT_FAILED otherwise (keep the ID)."""
+    data = parse.urlencode({"chat_id": chat, "message_id": msg_id, "text": text}).encode()
+    try:
+        req = request.Request(telegram_api_url(cfg, token, "editMessageText"), data=data,
+                              headers={"Content-Type": "application/x-www-form-urlencoded"})
+        with request.urlopen(req, timeout=5) as _:
+            pass
+        return EDITED
+    except urlerror.HTTPError as e:
+        try:
+            body = e.read().decode(errors="ignore")
+        except Exception:
+            body = ""
+        if "message is not modified" in body:
+            return EDITED
+        if e.code == 400 and "message to edit not found" in body:
+            print(f"Telegram status message in {chat} is gone (deleted?), posting a new one", file=sys.stderr)
+            return EDIT_GONE
+        print(f"Telegram edit failed for {chat}: {e} {body}".rstrip(), file=sys.stderr)
+        return EDIT_FAILED
+    except Exception as e:
+        print(f"Telegram edit failed for {chat}: {e}", file=sys.stderr)
+        return EDIT_FAILED
+
+def send_telegram(cfg, note, hostname, intip, extip, dry_run=False, extra_fields=None, status=False):
+    """sendMessage to the group and/or chat. With status=True, edit this host's stored
+    status message per chat instead (editMessageText), posting a new one if there is none."""
     token = cfg.get("TGTOKEN", "")
     chat_id = cfg.get("TGCHATID", "")
     grp_id = cfg.get("TGGRPID", "")
@@ -498,16 +835,36 @@ def send_telegram(cfg, note, hostname, intip, extip, dry_run=False):
         print("Warning: Telegram not configured (TGTOKEN + TGGRPID/TGCHATID).", file=sys.stderr)
         return False
     msg = f"{note}\nHostname: {hostname}\nInternal IP: {intip}\nExternal IP: {extip}"
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    msg += "".join(f"\n{k}: {v}" for k, v in (extra_fields or []))
+    if status:
+        # An edited message keeps its original date, so say when it was last refreshed
+        msg += f"\nUpdated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}"
+    url = telegram_api_url(cfg, token, "sendMessage")
     def post_to(chat):
+        edit_key = status_message_key("telegram", hostname, f"{token}:{chat}") if status else None
+        msg_id = get_status_message_id(cfg, edit_key) if edit_key else None
         data = parse.urlencode({"chat_id": chat, "text": msg}).encode()
         if dry_run:
-            print(f"[DRY RUN] Telegram sendMessage to {chat}: {msg}")
+            if msg_id:
+                print(f"[DRY RUN] Telegram editMessageText {msg_id} in {chat}: {msg}")
+            else:
+                print(f"[DRY RUN] Telegram sendMessage to {chat}: {msg}")
             return True
+        if msg_id:
+            outcome = _telegram_edit(cfg, token, chat, msg_id, msg)
+            if outcome != EDIT_GONE:
+                return outcome == EDITED
+            set_status_message_id(cfg, edit_key, None)
         try:
             req = request.Request(url, data=data, headers={"Content-Type": "application/x-www-form-urlencoded"})
-            with request.urlopen(req, timeout=5) as _:
-                pass
+            with request.urlopen(req, timeout=5) as resp:
+                resp_body = resp.read()
+            if edit_key:
+                try:
+                    new_id = json.loads(resp_body.decode() or "{}").get("result", {}).get("message_id")
+                except (ValueError, AttributeError):
+                    new_id = None
+                set_status_message_id(cfg, edit_key, new_id)
             return True
         except Exception as e:
             print(f"Telegram send failed for {chat}: {e}", file=sys.stderr)
@@ -519,6 +876,273 @@ def send_telegram(cfg, note, hostname, intip, extip, dry_run=False):
         ok = post_to(chat_id) and ok
     return ok
 
+def _is_yes(val):
+    return str(val).strip().upper() == "YES"
+
+def _flag(cfg, key, inferred):
+    """YES/NO flag from the INI, falling back to `inferred` when the key is absent."""
+    return _is_yes(cfg.get(key)) if key in cfg else bool(inferred)
+
+def _split_list(val):
+    return [p for p in re.split(r"[\s,]+", val or "") if p]
+
+def _cfg_float(cfg, key, default):
+    """Numeric INI setting; falls back to `default` when unset or not a number."""
+    try:
+        return float(cfg.get(key) or default)
+    except ValueError:
+        print(f"Warning: {key}={cfg.get(key)!r} is not a number, using {default}", file=sys.stderr)
+        return float(default)
+
+def health_enabled(cfg):
+    return _flag(cfg, "REPORT_HEALTH", True)
+
+def _utc_stamp():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+class Sink:
+    """A report destination. Subclasses implement from_cfg() and send().
+
+    `report` is a dict with note, hostname, intip, extip, os_name, kernel and uptime, plus
+    health (raw sample_health() dict with deltas) when REPORT_HEALTH is on.
+    Sinks that only need the IPs set needs_host_facts = False and go out first.
+    status_update is set per run: True for routine (scheduled/manual) reports that may
+    update a status message in place.
+    """
+    kind = ""
+    needs_host_facts = True
+    status_update = False
+
+    def __init__(self, cfg, name):
+        self.cfg = cfg
+        self.name = name
+
+    @classmethod
+    def from_cfg(cls, cfg):
+        return []
+
+    def send(self, report, dry_run=False):
+        raise NotImplementedError
+
+class DiscordSink(Sink):
+    """DISCORD_WEBHOOK_URL plus any DISCORD_EXTRA_WEBHOOK_URLS (space/comma separated)."""
+    kind = "discord"
+
+    def __init__(self, cfg, name, url):
+        super().__init__(cfg, name)
+        self.url = url
+
+    @classmethod
+    def from_cfg(cls, cfg):
+        if not ensure_ini_enable_flags(cfg)[0]:
+            return []
+        urls = [(cfg.get("DISCORD_WEBHOOK_URL") or "").strip()] + _split_list(cfg.get("DISCORD_EXTRA_WEBHOOK_URLS"))
+        urls = [u for u in urls if u]
+        if not urls:
+            # Enabled with no webhook at all: keep one sink so send_discord() reports the missing URL
+            urls = [""]
+        return [cls(cfg, "discord" if i == 0 else f"discord#{i + 1}", u) for i, u in enumerate(urls)]
+
+    def send(self, report, dry_run=False):
+        r = report
+        return send_discord(self.cfg, r["note"], r["hostname"], r["intip"], r["extip"], r["os_name"],
+                            r["kernel"], r["uptime"], dry_run=dry_run, url=self.url,
+                            extra_fields=health_fields(r.get("health")),
+                            status=self.status_update and status_edit_enabled(self.cfg))
+
+class TelegramSink(Sink):
+    kind = "telegram"
+
+    def __init__(self, cfg, name):
+        super().__init__(cfg, name)
+        # The text only carries the IPs, unless health lines are appended
+        self.needs_host_facts = health_enabled(cfg)
+
+    @classmethod
+    def from_cfg(cls, cfg):
+        return [cls(cfg, "telegram")] if ensure_ini_enable_flags(cfg)[1] else []
+
+    def send(self, report, dry_run=False):
+        r = report
+        return send_telegram(self.cfg, r["note"], r["hostname"], r["intip"], r["extip"], dry_run=dry_run,
+                             extra_fields=health_fields(r.get("health")),
+                             status=self.status_update and status_edit_enabled(self.cfg))
+
+class WebhookSink(Sink):
+    """POST the report as plain JSON to WEBHOOK_URL (e.g. a central relay)."""
+    kind = "webhook"
+
+    @classmethod
+    def from_cfg(cls, cfg):
+        url = (cfg.get("WEBHOOK_URL") or "").strip()
+        return [cls(cfg, "webhook")] if url and _flag(cfg, "ENABLE_WEBHOOK", url) else []
+
+    def send(self, report, dry_run=False):
+        url = self.cfg["WEBHOOK_URL"].strip()
+        payload = dict(report, timestamp=_utc_stamp())
+        if dry_run:
+            print(f"[DRY RUN] Webhook POST to {url}:", json.dumps(payload))
+            return True
+        headers = {"Content-Type": "application/json", "User-Agent": "pi-ip-logger/1.0"}
+        # Optional "Header-Name: value", e.g. "Authorization: Bearer xyz"
+        auth = (self.cfg.get("WEBHOOK_AUTH_HEADER") or "").strip()
+        if ":" in auth:
+            k, v = auth.split(":", 1)
+            headers[k.strip()] = v.strip()
+        try:
+            req = request.Request(url, data=json.dumps(payload).encode(), headers=headers)
+            with request.urlopen(req, timeout=5) as _:
+                pass
+            return True
+        except Exception as e:
+            print(f"Webhook send failed: {e}", file=sys.stderr)
+            return False
+
+class SyslogSink(Sink):
+    """One line to the local syslog (ident log-my-ip, facility SYSLOG_FACILITY, default USER)."""
+    kind = "syslog"
+
+    @classmethod
+    def from_cfg(cls, cfg):
+        return [cls(cfg, "syslog")] if _is_yes(cfg.get("ENABLE_SYSLOG", "NO")) else []
+
+    def send(self, report, dry_run=False):
+        r = report
+        msg = (f"{r['note']}: host={r['hostname']} int={r['intip']} ext={r['extip']} "
+               f"os=\"{r['os_name']}\" kernel={r['kernel']} uptime=\"{r['uptime']}\"")
+        if dry_run:
+            print(f"[DRY RUN] syslog: {msg}")
+            return True
+        try:
+            import syslog
+            facility = (self.cfg.get("SYSLOG_FACILITY") or "USER").strip().upper()
+            syslog.openlog("log-my-ip", 0, getattr(syslog, f"LOG_{facility}", syslog.LOG_USER))
+            syslog.syslog(syslog.LOG_INFO, msg)
+            return True
+        except Exception as e:
+            print(f"Syslog send failed: {e}", file=sys.stderr)
+            return False
+
+class JsonlSink(Sink):
+    """Append the report as one JSON line to JSONL_PATH."""
+    kind = "jsonl"
+
+    @classmethod
+    def from_cfg(cls, cfg):
+        path = (cfg.get("JSONL_PATH") or "").strip()
+        return [cls(cfg, "jsonl")] if path and _flag(cfg, "ENABLE_JSONL", path) else []
+
+    def send(self, report, dry_run=False):
+        path = os.path.expanduser(self.cfg["JSONL_PATH"].strip())
+        line = json.dumps(dict(report, timestamp=_utc_stamp()))
+        if dry_run:
+            print(f"[DRY RUN] JSONL append to {path}: {line}")
+            return True
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            return True
+        except Exception as e:
+            print(f"JSONL write failed: {e}", file=sys.stderr)
+            return False
+
+# Registry of sink kinds; order is also the --dry-run print order.
+SINK_TYPES = {
+    "discord": DiscordSink,
+    "telegram": TelegramSink,
+    "webhook": WebhookSink,
+    "syslog": SyslogSink,
+    "jsonl": JsonlSink,
+}
+
+def sink_timeout(cfg):
+    """SINK_TIMEOUT seconds (default 30); non-numeric or non-positive values use the default."""
+    timeout = _cfg_float(cfg, "SINK_TIMEOUT", 30)
+    return timeout if timeout > 0 else 30.0
+
+def build_sinks(cfg):
+    sinks = []
+    for sink_cls in SINK_TYPES.values():
+        sinks.extend(sink_cls.from_cfg(cfg))
+    return sinks
+
+class SinkWorker:
+    """Worker thread for one sink, so a slow sink can't stall the others.
+
+    Workers live for one run and get one report each; the queue only hands it over.
+    Counts sent and failed reports plus send latency.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.queue = queue.Queue()
+        self.sent = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self._lock = threading.Lock()
+        # Run in the creator's context, like _submit() does for pool work.
+        self._thread = threading.Thread(target=contextvars.copy_context().run, args=(self._loop,),
+                                        name=f"sink-{sink.name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, report, dry_run=False):
+        self.queue.put((report, dry_run))
+
+    def deliver(self, report, dry_run=False):
+        """Send on the calling thread and record the outcome."""
+        start = time.monotonic()
+        try:
+            ok = bool(self.sink.send(report, dry_run=dry_run))
+        except Exception as e:
+            print(f"Sink {self.sink.name} failed: {e}", file=sys.stderr)
+            ok = False
+        elapsed = time.monotonic() - start
+        with self._lock:
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+        return ok
+
+    def _loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            self.deliver(*item)
+
+    def close(self, deadline):
+        """Drain and stop; False if still busy at `deadline` (time.monotonic())."""
+        self.queue.put(None)
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+        return not self._thread.is_alive()
+
+    def abandon(self):
+        """Mark a sink that missed the deadline as failed; its daemon thread dies with us."""
+        with self._lock:
+            self.failed += 1
+
+    def ok(self):
+        with self._lock:
+            return self.sent > 0 and not self.failed
+
+    def stats(self):
+        with self._lock:
+            n = self.sent + self.failed
+            return {
+                "sent": self.sent,
+                "failed": self.failed,
+                "avg_ms": round(self.latency_total / n * 1000, 1) if n else 0.0,
+                "max_ms": round(self.latency_max * 1000, 1),
+            }
+
 def notify_discord_update(cfg, hostname, branch, old_ref, new_ref):
     url = cfg.get("DISCORD_WEBHOOK_URL", "")
     if not url:
@@ -551,7 +1175,7 @@ def notify_telegram_update(cfg, hostname, branch, old_ref, new_ref):
     if not token or not grp_id:
         return
     msg = f"Self-update applied on {hostname} (branch {branch}): {old_ref[:7]} -> {new_ref[:7]}"
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    url = telegram_api_url(cfg, token, "sendMessage")
     data = parse.urlencode({"chat_id": grp_id, "text": msg}).encode()
     try:
         req = request.Request(url, data=data, headers={"Content-Type": "application/x-www-form-urlencoded"})
@@ -559,9 +1183,244 @@ def notify_telegram_update(cfg, hostname, branch, old_ref, new_ref):
     except Exception:
         pass
 
+# Answers that mean "this name doesn't resolve", as opposed to "couldn't ask" (EAI_AGAIN etc.)
+NEGATIVE_DNS_ERRORS = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+
+class DnsCache:
+    """Persistent cache in front of socket.getaddrinfo, which every urllib request resolves through.
+
+    - Fresh entries (younger than DNS_CACHE_TTL, default 1h) are answered from the cache.
+    - Expired entries within DNS_CACHE_STALE (default 24h) are still answered, and
+      refreshed on a background thread (stale-while-revalidate). They are also the
+      fallback when a fresh lookup fails.
+    - Names the resolver says don't exist are remembered for DNS_CACHE_NEGATIVE_TTL (default
+      60s). Temporary failures (no network or resolver yet, e.g. early at boot) are not.
+    Only plain hostname lookups for TCP are cached; IP literals and special flags pass through.
+    """
+    STATE_FILE = "dns-cache.json"
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.ttl = _cfg_float(cfg, "DNS_CACHE_TTL", 3600)
+        self.stale = _cfg_float(cfg, "DNS_CACHE_STALE", 86400)
+        self.neg_ttl = _cfg_float(cfg, "DNS_CACHE_NEGATIVE_TTL", 60)
+        self.entries = load_state(cfg, self.STATE_FILE).get("entries", {})
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._refreshing = {}
+        self._orig = None
+
+    def install(self):
+        if self._orig is None:
+            self._orig = socket.getaddrinfo
+            socket.getaddrinfo = self.getaddrinfo
+        return self
+
+    def uninstall(self):
+        if self._orig is not None:
+            socket.getaddrinfo = self._orig
+            self._orig = None
+
+    def _lookup(self, host):
+        """Resolve for real and store the result; raises socket.gaierror on failure."""
+        now = time.time()
+        try:
+            infos = self._orig(host, None, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            with self._lock:
+                old = self.entries.get(host)
+                if old and not old.get("neg") and now < old["expires"] + self.stale:
+                    # stale-if-error: keep the last good answer
+                    return old["addrs"]
+                if e.errno in NEGATIVE_DNS_ERRORS:
+                    self.entries[host] = {"neg": True, "expires": now + self.neg_ttl}
+                    self._dirty = True
+            raise
+        addrs = []
+        for family, _, _, _, sockaddr in infos:
+            if family in (socket.AF_INET, socket.AF_INET6) and [int(family), sockaddr[0]] not in addrs:
+                addrs.append([int(family), sockaddr[0]])
+        with self._lock:
+            self.entries[host] = {"addrs": addrs, "expires": now + self.ttl}
+            self._dirty = True
+        return addrs
+
+    def _refresh(self, host):
+        try:
+            self._lookup(host)
+        except (OSError, UnicodeError):
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.pop(host, None)
+
+    def _cacheable(self, host, type, flags):
+        if not isinstance(host, str) or not host or flags or type not in (0, socket.SOCK_STREAM):
+            return False
+        try:
+            socket.inet_pton(socket.AF_INET6 if ":" in host else socket.AF_INET, host)
+            return False
+        except OSError:
+            return host.lower() != "localhost"
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        if not self._cacheable(host, type, flags):
+            return self._orig(host, port, family, type, proto, flags)
+        key = host.lower().rstrip(".")
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry.get("neg") and now < entry["expires"]:
+                self.negative_hits += 1
+                raise socket.gaierror(socket.EAI_NONAME, "Name or service not known (cached)")
+            if entry and not entry.get("neg") and now < entry["expires"]:
+                self.hits += 1
+                addrs = entry["addrs"]
+            elif entry and not entry.get("neg") and now < entry["expires"] + self.stale:
+                self.stale_hits += 1
+                addrs = entry["addrs"]
+                if key not in self._refreshing:
+                    t = threading.Thread(target=self._refresh, args=(key,), name=f"dns-refresh-{key}", daemon=True)
+                    self._refreshing[key] = t
+                    t.start()
+            else:
+                self.misses += 1
+                addrs = None
+        if addrs is None:
+            addrs = self._lookup(key)
+        if isinstance(port, str):
+            port = socket.getservbyname(port, "tcp") if not port.isdigit() else int(port)
+        out = []
+        for fam, ip in addrs:
+            if family not in (0, fam):
+                continue
+            sockaddr = (ip, port or 0) if fam == socket.AF_INET else (ip, port or 0, 0, 0)
+            out.append((socket.AddressFamily(fam), socket.SOCK_STREAM, proto or socket.IPPROTO_TCP, "", sockaddr))
+        if not out:
+            raise socket.gaierror(socket.EAI_ADDRFAMILY, "No address for requested family (cached)")
+        return out
+
+    def save(self, wait=2.0):
+        """Persist entries (after giving in-flight refreshes up to `wait` seconds)."""
+        deadline = time.monotonic() + wait
+        with self._lock:
+            pending = list(self._refreshing.values())
+        for t in pending:
+            t.join(max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            keep = {h: e for h, e in self.entries.items()
+                    if now < e["expires"] + (0 if e.get("neg") else self.stale)}
+            self._dirty = False
+        save_state(self.cfg, self.STATE_FILE, {"entries": keep})
+
+    def stats(self):
+        return {"hits": self.hits, "stale": self.stale_hits, "misses": self.misses, "negative": self.negative_hits}
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens/second, holding at most `burst`.
+
+    acquire() reserves a token and sleeps until it is due, so concurrent callers queue in order.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.waits = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            if wait:
+                self.waits += 1
+                self.waited += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+class _RateLimitHandler(request.BaseHandler):
+    """urllib pre-processor that takes a token before every HTTP(S) request."""
+    handler_order = 100
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+
+    def http_request(self, req):
+        self.bucket.acquire()
+        return req
+
+    https_request = http_request
+
+def install_rate_limit(cfg):
+    """Route all urllib requests through a TokenBucket (HTTP_RATE/s, HTTP_BURST); None if HTTP_RATE=0.
+
+    The bucket is per process, so it can't spread load across hosts (the schedule slot does
+    that). The default burst covers a full run (update notices, IP-echo fallbacks, every
+    sink) so ordinary runs never wait; it only caps runaway request loops.
+    """
+    try:
+        rate = float(cfg.get("HTTP_RATE") or 2)
+        burst = float(cfg.get("HTTP_BURST") or 16)
+    except ValueError:
+        rate, burst = 2.0, 16.0
+    if rate <= 0:
+        return None
+    bucket = TokenBucket(rate, burst)
+    request.install_opener(request.build_opener(_RateLimitHandler(bucket)))
+    return bucket
+
+def schedule_offset(hostname, window):
+    """Stable per-host offset in [0, window) seconds, from a hash of the hostname.
+
+    Hosts spread evenly over the window without talking to each other, and each
+    host keeps the same slot from run to run.
+    """
+    if window <= 0:
+        return 0.0
+    h = int.from_bytes(hashlib.sha256(hostname.encode()).digest()[:8], "big")
+    return (h % int(window * 1000)) / 1000.0
+
+def jitter_window(cfg):
+    try:
+        return max(0.0, float(cfg.get("SCHEDULE_JITTER_WINDOW") or 600))
+    except ValueError:
+        return 600.0
+
+def next_slot(now, interval, offset):
+    """First time after `now` that is `offset` seconds into an interval-aligned slot.
+
+    Slots are aligned to the Unix epoch, so a daily interval starts at 00:00 UTC.
+    """
+    t = now - (now % interval) + offset
+    return t if t > now else t + interval
+
+def wait_for_slot(cfg, hostname):
+    """For cron --scheduled runs: sleep until this host's offset past the minute cron fired on."""
+    offset = schedule_offset(hostname, jitter_window(cfg))
+    now = time.time()
+    delay = now - (now % 60) + offset - now
+    if delay > 0:
+        time.sleep(delay)
+    return delay
+
 def can_resolve(host):
     try:
-        socket.gethostbyname(host)
+        # getaddrinfo (not gethostbyname) so the DNS cache answers when installed
+        socket.getaddrinfo(host, None, 0, socket.SOCK_STREAM)
         return True
     except Exception:
         return False
@@ -596,13 +1455,21 @@ def self_update_if_needed(cfg, args, hostname):
         notify_telegram_update(cfg, hostname, branch, local_before, local_after)
     print("Running the new version...")
     argv = [sys.executable, script_abs] + args.original_argv
+    if args.scheduled and "--no-jitter" not in argv:
+        # We already waited for our slot; the new process must not wait again from its own minute
+        argv.append("--no-jitter")
     os.execv(sys.executable, argv)
 
 def parse_args():
     p = argparse.ArgumentParser(description="Send IP info to Telegram and/or Discord")
     p.add_argument("-m", "--note", default=None, help="Message to send")
     p.add_argument("--reboot", action="store_true", help="Use note REBOOT and skip self-update")
-    p.add_argument("--scheduled", action="store_true", help="Use note SCHEDULED")
+    p.add_argument("--scheduled", action="store_true",
+                   help="Use note SCHEDULED, after waiting for this host's slot in SCHEDULE_JITTER_WINDOW")
+    p.add_argument("--daemon", action="store_true",
+                   help="Stay running and send a SCHEDULED report every SCHEDULE_INTERVAL at this host's slot")
+    p.add_argument("--no-jitter", dest="no_jitter", action="store_true",
+                   help="With --scheduled, send immediately instead of waiting for this host's slot")
     p.add_argument(
         "--ini",
         default=None,
@@ -612,6 +1479,7 @@ def parse_args():
         ),
     )
     p.add_argument("-n", "--dry-run", action="store_true", help="Print what would be sent without sending")
+    p.add_argument("--stats", action="store_true", help="Print per-run counters (per-sink sends and latency, DNS cache hits/misses)")
     p.add_argument("--enable-self-update", dest="enable_self_update", action="store_true",
                    help="Write USE_SELFUPATE=YES and GIT_BRANCH=\"main\" to the INI and exit")
     p.add_argument("--patch-ini", dest="patch_ini", action="store_true",
@@ -621,9 +1489,11 @@ def parse_args():
     args, rest = p.parse_known_args()
     args.positional = rest
     args.original_argv = sys.argv[1:]
+    # Only routine reports may edit the status message in place; REBOOT and notes post anew
+    args.explicit_note = not (args.reboot or args.scheduled or args.daemon) and bool(args.note or args.positional)
     if args.reboot:
         args.note = "REBOOT"
-    elif args.scheduled:
+    elif args.scheduled or args.daemon:
         args.note = "SCHEDULED"
     elif args.note:
         pass
@@ -669,24 +1539,129 @@ def main():
     if getattr(args, "patch_ini", False):
         sys.exit(patch_ini(ini_path, dry_run=False))
     cfg = parse_ini(ini_path)
-    enable_discord, enable_telegram = ensure_ini_enable_flags(cfg)
+    dns = DnsCache(cfg).install() if _flag(cfg, "DNS_CACHE", True) else None
+    bucket = install_rate_limit(cfg)
     hostname = run(["hostname"]) or socket.gethostname()
-    self_update_if_needed(cfg, args, hostname)
+    try:
+        if args.daemon:
+            return run_daemon(args, ini_path, hostname, dns, bucket)
+        if args.scheduled and not args.no_jitter:
+            wait_for_slot(cfg, hostname)
+        return run_pipeline(cfg, args, ini_path, hostname)
+    finally:
+        finish_run(args, dns, bucket)
+        if dns is not None:
+            dns.uninstall()
+
+def finish_run(args, dns, bucket):
+    """Persist the DNS cache and print the run-level --stats counters."""
+    if dns is not None and not args.dry_run:
+        dns.save()
+    if not getattr(args, "stats", False):
+        return
+    if dns is not None:
+        st = dns.stats()
+        print(f"dns cache: hits={st['hits']} stale={st['stale']} misses={st['misses']} negative={st['negative']}")
+    if bucket is not None:
+        print(f"http rate limit: waits={bucket.waits} waited={bucket.waited:.2f}s")
+
+def run_daemon(args, ini_path, hostname, dns, bucket):
+    """Send a SCHEDULED report every SCHEDULE_INTERVAL seconds (default 86400) at this host's offset.
+
+    The INI is re-read before each report so changes apply without a restart.
+    """
+    while True:
+        cfg = parse_ini(ini_path)
+        try:
+            interval = max(60.0, float(cfg.get("SCHEDULE_INTERVAL") or 86400))
+        except ValueError:
+            interval = 86400.0
+        offset = schedule_offset(hostname, min(jitter_window(cfg), interval))
+        target = next_slot(time.time(), interval, offset)
+        print(f"Next report at {datetime.fromtimestamp(target).isoformat(timespec='seconds')}", flush=True)
+        time.sleep(max(0.0, target - time.time()))
+        try:
+            run_pipeline(cfg, args, ini_path, hostname)
+        except Exception as e:
+            print(f"Scheduled report failed: {e}", file=sys.stderr)
+        finish_run(args, dns, bucket)
+
+def _submit(pool, fn, *args, **kwargs):
+    """Submit to the pool carrying the caller's contextvars (fleet_loadgen.py keys simulated hosts on them)."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def print_stats(workers):
+    for w in workers:
+        st = w.stats()
+        print(f"sink {w.sink.name}: sent={st['sent']} failed={st['failed']} "
+              f"avg={st['avg_ms']}ms max={st['max_ms']}ms")
+
+def run_pipeline(cfg, args, ini_path, hostname):
+    """Gather facts and hand them to the configured sinks, overlapping independent phases.
+
+    The self-update check, internal IP wait, external IP lookup and host facts all start
+    at once, along with the health sample. Sinks get the report once the update check is done (it may re-exec us) and
+    their inputs are ready: IP-only sinks such as Telegram go first, the rest once the
+    host facts are in. Each sink sends from its own worker thread. If the external lookup
+    failed and the internal IP wasn't there at first, it is repeated once the network is up.
+    """
     network_range = cfg.get("_my_network_range", "")
     max_attempts = int(cfg.get("NETWORK_WAIT_MAX_ATTEMPTS", "24") or "24")
-    intip = wait_for_internal_ip(network_range, max_attempts=max_attempts)
-    extip = get_external_ip()
-    os_name, kernel, uptime = get_os_kernel_uptime()
-    if not (enable_discord or enable_telegram):
-        print(
-            f"No destination enabled. Set ENABLE_DISCORD=YES and/or ENABLE_TELEGRAM=YES in {ini_path}"
-        )
-        return 1
-    ok = True
-    if enable_discord:
-        ok = send_discord(cfg, args.note, hostname, intip, extip, os_name, kernel, uptime, dry_run=args.dry_run) and ok
-    if enable_telegram:
-        ok = send_telegram(cfg, args.note, hostname, intip, extip, dry_run=args.dry_run) and ok
+    sinks = build_sinks(cfg)
+    timeout = sink_timeout(cfg)
+    for s in sinks:
+        s.status_update = not (args.reboot or getattr(args, "explicit_note", False))
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        f_update = _submit(pool, self_update_if_needed, cfg, args, hostname)
+        if not sinks:
+            f_update.result()
+            print(
+                f"No destination enabled. Set ENABLE_DISCORD=YES and/or ENABLE_TELEGRAM=YES "
+                f"(or WEBHOOK_URL, ENABLE_SYSLOG, JSONL_PATH) in {ini_path}"
+            )
+            return 1
+        network_late = threading.Event()
+        f_intip = _submit(pool, wait_for_internal_ip, network_range, max_attempts=max_attempts, not_ready=network_late)
+        f_extip = _submit(pool, get_external_ip)
+        f_facts = _submit(pool, get_os_kernel_uptime)
+        # Persisted only once the report is out: a self-update re-exec or a failed send must
+        # not move the baseline that the next report's deltas are measured against
+        f_health = _submit(pool, collect_health, cfg, persist=False) if health_enabled(cfg) else None
+        f_update.result()
+        workers = [SinkWorker(s) for s in sinks]
+        extip = f_extip.result()
+        intip = f_intip.result()
+        if extip == "Unknown" and intip and network_late.is_set():
+            # The early lookup may have given up before the network came up (typical at boot): try again now
+            extip = get_external_ip()
+        report = {"note": args.note, "hostname": hostname, "intip": intip, "extip": extip}
+        if not args.dry_run:
+            for w in workers:
+                w.start()
+                if not w.sink.needs_host_facts:
+                    w.submit(report)
+        os_name, kernel, uptime = f_facts.result()
+        report = dict(report, os_name=os_name, kernel=kernel, uptime=uptime)
+        if f_health is not None:
+            report["health"] = f_health.result()
+    if args.dry_run:
+        # Dry runs send nothing; deliver inline so printed payloads keep registry order.
+        for w in workers:
+            w.deliver(report, dry_run=True)
+    else:
+        for w in workers:
+            if w.sink.needs_host_facts:
+                w.submit(report)
+        deadline = time.monotonic() + timeout
+        for w in workers:
+            if not w.close(deadline):
+                print(f"Sink {w.sink.name}: still sending after SINK_TIMEOUT, giving up", file=sys.stderr)
+                w.abandon()
+        if "health" in report and any(w.ok() for w in workers):
+            save_health(cfg, report["health"])
+    if getattr(args, "stats", False):
+        print_stats(workers)
+    ok = all(w.ok() for w in workers)
     return 0 if ok else 2
 
 if __name__ == "__main__":
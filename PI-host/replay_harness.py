@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Record/replay harness for log_my_ip.py runs.
+
+Turns a real (possibly slow) run into a cassette file that can be replayed
+offline with the same inputs and timings, so performance regressions can be
+reproduced and benchmarked without the original network or device.
+
+Behavior:
+- record: runs log_my_ip.main() with the given arguments and captures every
+  boundary call with its start offset and latency:
+    run() subprocess results, which() lookups, read_file() reads, state
+    files (load_state/save_state), DNS (socket.getaddrinfo), HTTP
+    request/response pairs (urllib urlopen, including error responses),
+    local sinks (JSONL/syslog), the --scheduled slot wait and self-update
+    re-execs (recorded, not performed).
+  Bot tokens and Discord webhook tokens are replaced by stable hashes (status
+  message state keys, which hash the real token, are mapped through them).
+- replay: runs log_my_ip.main() again with the cassette's arguments; each
+  boundary call is answered from the cassette after sleeping its recorded
+  latency times --time-scale (0 = as fast as possible). Nothing touches the
+  network, subprocesses or your state files. Calls the cassette doesn't know
+  get an empty/failed answer and are reported as misses.
+- bench: replays one or more cassettes several times and reports wall time;
+  exits 1 if a median exceeds --max-ms.
+
+Usage:
+  ./replay_harness.py record -o slow-pi.json -- --scheduled --ini /usr/local/etc/log-my-ip.ini
+  ./replay_harness.py replay slow-pi.json [--time-scale 0.5] [--quiet]
+  ./replay_harness.py bench cassettes/*.json --runs 5 --max-ms 8000
+"""
+import argparse
+import contextlib
+import hashlib
+import http.client
+import io
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib import error as urlerror
+from urllib import parse, request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import log_my_ip as lm  # noqa: E402
+
+CASSETTE_VERSION = 1
+SECRET_INI_KEYS = ("TGTOKEN", "WEBHOOK_AUTH_HEADER")
+_real = {
+    "getaddrinfo": socket.getaddrinfo,
+    "urlopen": request.urlopen,
+    "execv": os.execv,
+}
+
+
+# ---------------------------------------------------------------------------
+# Redaction
+# ---------------------------------------------------------------------------
+
+def _tag(secret: str) -> str:
+    return "REDACTED-" + hashlib.sha256(secret.encode()).hexdigest()[:12]
+
+
+def redact_url(url: str) -> str:
+    """Hide Discord webhook and Telegram bot tokens; stable so replayed URLs still match."""
+    url = re.sub(r"(/api/webhooks/[^/?#\s]+/)(?!REDACTED-)([^/?#\s\"']+)", lambda m: m.group(1) + _tag(m.group(2)), url)
+    return re.sub(r"(/bot)(?!REDACTED-)([^/?#\s\"']+)(/)", lambda m: m.group(1) + _tag(m.group(2)) + m.group(3), url)
+
+
+def stable_target(kind: str, target: str) -> str:
+    """Redacted form of a status-message target (webhook URL or "bot_token:chat")."""
+    if kind == "telegram" and ":" in target:
+        token, chat = target.rsplit(":", 1)
+        return f"{token if token.startswith('REDACTED-') else _tag(token)}:{chat}"
+    return redact_url(target)
+
+
+def redact_text(text: Optional[str]) -> Optional[str]:
+    """Redact secrets in INI-style text (other files pass through unchanged)."""
+    if not text:
+        return text
+    out = []
+    for line in text.splitlines(keepends=True):
+        key = line.split("=", 1)[0].strip()
+        if key in SECRET_INI_KEYS and "=" in line and "REDACTED-" not in line:
+            val = line.split("=", 1)[1].strip().split("#", 1)[0].strip().strip('"').strip("'")
+            line = f'{key}="{_tag(val)}"\n' if val else line
+        else:
+            line = redact_url(line)
+        out.append(line)
+    return "".join(out)
+
+
+# ---------------------------------------------------------------------------
+# Response objects
+# ---------------------------------------------------------------------------
+
+def _headers(items) -> http.client.HTTPMessage:
+    msg = http.client.HTTPMessage()
+    for k, v in items or []:
+        msg[k] = v
+    return msg
+
+
+class _Response(io.BytesIO):
+    """Minimal stand-in for the object urlopen returns (read(), status, headers, context manager)."""
+
+    def __init__(self, url: str, status: int, headers, body: bytes):
+        super().__init__(body)
+        self.url = url
+        self.status = self.code = status
+        self.headers = _headers(headers)
+
+    def getcode(self):
+        return self.status
+
+    def geturl(self):
+        return self.url
+
+    def info(self):
+        return self.headers
+
+
+def _encode(obj):
+    """JSON-safe copy of getaddrinfo results (tuples → lists, enums → ints)."""
+    if isinstance(obj, (list, tuple)):
+        return [_encode(x) for x in obj]
+    if isinstance(obj, int):
+        return int(obj)
+    return obj
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.t0 = time.monotonic()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _add(self, kind: str, key, start: float, latency: float, **fields) -> None:
+        ev = {"kind": kind, "key": key, "t": round(start - self.t0, 6), "latency": round(latency, 6)}
+        ev.update(fields)
+        with self._lock:
+            self.events.append(ev)
+
+    def _nested(self) -> bool:
+        return getattr(self._local, "depth", 0) > 0
+
+    @contextlib.contextmanager
+    def _outer(self):
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield
+        finally:
+            self._local.depth -= 1
+
+    def _simple(self, kind: str, fn, key_fn, result_fn=lambda r: r, outer: bool = False):
+        def wrapper(*args, **kwargs):
+            if self._nested() and not outer:
+                return fn(*args, **kwargs)
+            start = time.monotonic()
+            if outer:
+                with self._outer():
+                    result = fn(*args, **kwargs)
+            else:
+                result = fn(*args, **kwargs)
+            # snapshot now: callers mutate what load_state hands back
+            snapshot = json.loads(json.dumps(result_fn(result), default=str))
+            self._add(kind, key_fn(*args, **kwargs), start, time.monotonic() - start, result=snapshot)
+            return result
+        return wrapper
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = [host, port, int(family), int(type), int(proto), int(flags)]
+        start = time.monotonic()
+        try:
+            res = _real["getaddrinfo"](host, port, family, type, proto, flags)
+        except socket.gaierror as e:
+            self._add("dns", key, start, time.monotonic() - start, error=[e.errno, str(e)])
+            self._dns_time(time.monotonic() - start)
+            raise
+        self._add("dns", key, start, time.monotonic() - start, result=_encode(res))
+        self._dns_time(time.monotonic() - start)
+        return res
+
+    def _dns_time(self, seconds: float) -> None:
+        # DNS done inside an HTTP request is recorded on its own and taken out of the HTTP latency
+        self._local.dns = getattr(self._local, "dns", 0.0) + seconds
+
+    def urlopen(self, url, data=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, **kwargs):
+        req = url if isinstance(url, request.Request) else request.Request(url, data=data)
+        if data is not None and isinstance(url, request.Request):
+            req.data = data
+        key = [req.get_method(), redact_url(req.full_url)]
+        body = req.data if isinstance(req.data, bytes) else b""
+        self._local.dns = 0.0
+        start = time.monotonic()
+
+        def latency():
+            return max(0.0, time.monotonic() - start - getattr(self._local, "dns", 0.0))
+
+        try:
+            with self._outer():
+                with _real["urlopen"](req, timeout=timeout, **kwargs) as resp:
+                    resp_body = resp.read()
+                    status = resp.status
+                    headers = list(resp.headers.items())
+                    final_url = resp.geturl()
+        except urlerror.HTTPError as e:
+            try:
+                err_body = e.read()
+            except Exception:
+                err_body = b""
+            self._add("http", key, start, latency(), request_body=body.decode(errors="replace"),
+                      status=e.code, reason=str(e.reason), headers=list((e.headers or {}).items()),
+                      body=err_body.decode(errors="replace"))
+            raise urlerror.HTTPError(req.full_url, e.code, e.reason, e.headers, io.BytesIO(err_body))
+        except Exception as e:
+            self._add("http", key, start, latency(), request_body=body.decode(errors="replace"),
+                      error=f"{type(e).__name__}: {e}")
+            raise
+        self._add("http", key, start, latency(), request_body=body.decode(errors="replace"),
+                  status=status, headers=headers, body=resp_body.decode(errors="replace"))
+        return _Response(final_url, status, headers, resp_body)
+
+    def execv(self, path, argv):
+        self._add("execv", list(argv[1:]), time.monotonic(), 0.0)
+        print("[record] self-update re-exec captured; stopping here instead of re-executing", file=sys.stderr)
+        raise SystemExit(0)
+
+    def install(self) -> None:
+        lm.run = self._simple("run", lm.run, lambda cmd, cwd=None, quiet=True: [list(cmd), cwd])
+        lm.which = self._simple("which", lm.which, lambda cmd: cmd)
+        lm.read_file = self._simple("read_file", lm.read_file, lambda path: path, redact_text)
+        lm.load_state = self._simple("load_state", lm.load_state, lambda cfg, name: name, outer=True)
+        lm.save_state = self._simple("save_state", lm.save_state, lambda cfg, name, data: name, lambda r: None, outer=True)
+        lm.wait_for_slot = self._simple("slot", lm.wait_for_slot, lambda cfg, hostname: hostname)
+        lm.status_message_key = self._simple("status_key", lm.status_message_key,
+                                             lambda kind, hostname, target: [kind, hostname, stable_target(kind, target)])
+        for sink_cls in (lm.JsonlSink, lm.SyslogSink):
+            sink_cls.send = self._simple("sink", sink_cls.send, lambda sink, report, dry_run=False: sink.name)
+        socket.getaddrinfo = self.getaddrinfo
+        request.urlopen = self.urlopen
+        os.execv = self.execv
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class _ScaledTime:
+    """Stand-in for the time module inside log_my_ip: sleeps are scaled and time.time()
+    starts from the recording's wall clock, so TTL checks (DNS cache, health deltas) decide
+    the same way they did when recorded."""
+
+    def __init__(self, scale: float, epoch: Optional[float]):
+        self.scale = scale
+        self.offset = (epoch - time.time()) if epoch else 0.0
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    def time(self):
+        return time.time() + self.offset
+
+    def sleep(self, seconds):
+        if self.scale > 0 and seconds > 0:
+            time.sleep(seconds * self.scale)
+
+
+class Player:
+    def __init__(self, cassette: Dict[str, Any], scale: float):
+        self.scale = scale
+        self.epoch = cassette.get("epoch")
+        self.queues: Dict[tuple, deque] = defaultdict(deque)
+        self.by_host: Dict[str, deque] = defaultdict(deque)
+        for ev in cassette["events"]:
+            self.queues[(ev["kind"], json.dumps(ev["key"]))].append(ev)
+            if ev["kind"] == "dns":
+                self.by_host[str(ev["key"][0])].append(ev)
+        self.misses: List[str] = []
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def _take(self, kind: str, key) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            q = self.queues.get((kind, json.dumps(key)))
+            if q:
+                ev = q.popleft()
+                if kind == "dns":
+                    self.by_host[str(key[0])].remove(ev)
+            elif kind == "dns" and self.by_host.get(str(key[0])):
+                # same host, different port/flags (e.g. cache on vs off): close enough
+                ev = self.by_host[str(key[0])].popleft()
+                self.queues[(kind, json.dumps(ev["key"]))].remove(ev)
+            else:
+                self.misses.append(f"{kind} {json.dumps(key)}")
+                return None
+            self.used += 1
+        if self.scale > 0 and ev["latency"] > 0:
+            time.sleep(ev["latency"] * self.scale)
+        return ev
+
+    def _simple(self, kind: str, key_fn, default, result_fn=lambda ev: ev.get("result")):
+        def stub(*args, **kwargs):
+            ev = self._take(kind, key_fn(*args, **kwargs))
+            return default() if ev is None else result_fn(ev)
+        return stub
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        ev = self._take("dns", [host, port, int(family), int(type), int(proto), int(flags)])
+        if ev is None:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known (not in cassette)")
+        if "error" in ev:
+            raise socket.gaierror(ev["error"][0], ev["error"][1])
+        out = []
+        for fam, typ, prt, canon, addr in ev["result"]:
+            if isinstance(port, int) and port:
+                addr = [addr[0], port] + addr[2:]
+            out.append((socket.AddressFamily(fam), socket.SocketKind(typ), prt, canon, tuple(addr)))
+        return out
+
+    def urlopen(self, url, data=None, timeout=None, **kwargs):
+        req = url if isinstance(url, request.Request) else request.Request(url, data=data)
+        parts = parse.urlsplit(req.full_url)
+        dns_error = None
+        if parts.hostname:
+            # resolve like urllib would, so the DNS cache sees the same lookups
+            try:
+                socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80),
+                                   0, socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                dns_error = e
+        ev = self._take("http", [req.get_method(), redact_url(req.full_url)])
+        if dns_error is not None:
+            raise urlerror.URLError(dns_error)
+        if ev is None:
+            raise urlerror.URLError("not in cassette")
+        if "error" in ev:
+            raise urlerror.URLError(ev["error"])
+        body = ev.get("body", "").encode()
+        if ev["status"] >= 400:
+            raise urlerror.HTTPError(req.full_url, ev["status"], ev.get("reason", ""), _headers(ev.get("headers")),
+                                     io.BytesIO(body))
+        return _Response(req.full_url, ev["status"], ev.get("headers"), body)
+
+    def execv(self, path, argv):
+        self._take("execv", list(argv[1:]))
+        raise SystemExit(0)
+
+    def install(self) -> None:
+        lm.time = _ScaledTime(self.scale, self.epoch)
+        lm.run = self._simple("run", lambda cmd, cwd=None, quiet=True: [list(cmd), cwd], lambda: "")
+        lm.which = self._simple("which", lambda cmd: cmd, lambda: False)
+        lm.read_file = self._simple("read_file", lambda path: path, lambda: None)
+        lm.load_state = self._simple("load_state", lambda cfg, name: name, dict)
+        lm.save_state = self._simple("save_state", lambda cfg, name, data: name, lambda: None)
+        lm.wait_for_slot = self._simple("slot", lambda cfg, hostname: hostname, lambda: 0.0)
+        lm.status_message_key = self._simple("status_key",
+                                             lambda kind, hostname, target: [kind, hostname, stable_target(kind, target)],
+                                             lambda: "")
+        for sink_cls in (lm.JsonlSink, lm.SyslogSink):
+            sink_cls.send = self._simple("sink", lambda sink, report, dry_run=False: sink.name, lambda: False)
+        socket.getaddrinfo = self.getaddrinfo
+        request.urlopen = self.urlopen
+        os.execv = self.execv
+
+    def unused(self) -> int:
+        return sum(len(q) for q in self.queues.values())
+
+
+# ---------------------------------------------------------------------------
+# Driving log_my_ip.main()
+# ---------------------------------------------------------------------------
+
+def _run_main(argv: List[str], quiet: bool) -> int:
+    old_argv = sys.argv
+    sys.argv = [lm.__file__] + list(argv)
+    sink = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext(), \
+                contextlib.redirect_stderr(sink) if quiet else contextlib.nullcontext():
+            try:
+                return lm.main() or 0
+            except SystemExit as e:
+                return e.code if isinstance(e.code, int) else 0
+    finally:
+        sys.argv = old_argv
+
+
+def _fresh_module():
+    """Re-import log_my_ip so every replay starts from unpatched functions."""
+    global lm
+    socket.getaddrinfo = _real["getaddrinfo"]
+    request.urlopen = _real["urlopen"]
+    os.execv = _real["execv"]
+    sys.modules.pop("log_my_ip", None)
+    import log_my_ip as fresh
+    lm = fresh
+    return fresh
+
+
+def load_cassette(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        cassette = json.load(f)
+    if cassette.get("version") != CASSETTE_VERSION:
+        raise SystemExit(f"{path}: unsupported cassette version {cassette.get('version')}")
+    return cassette
+
+
+def replay_once(cassette: Dict[str, Any], scale: float, quiet: bool) -> Dict[str, Any]:
+    _fresh_module()
+    player = Player(cassette, scale)
+    player.install()
+    start = time.monotonic()
+    try:
+        rc = _run_main(cassette["argv"], quiet)
+    finally:
+        wall = time.monotonic() - start
+        _fresh_module()
+    return {"rc": rc, "wall_s": wall, "misses": player.misses, "unused": player.unused(), "used": player.used}
+
+
+def cmd_record(args) -> int:
+    argv = args.argv[1:] if args.argv[:1] == ["--"] else args.argv
+    rec = Recorder()
+    rec.install()
+    epoch = time.time()
+    start = time.monotonic()
+    try:
+        rc = _run_main(argv, quiet=False)
+    finally:
+        wall = time.monotonic() - start
+        _fresh_module()
+    cassette = {
+        "version": CASSETTE_VERSION,
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "epoch": epoch,
+        "argv": argv,
+        "rc": rc,
+        "wall_s": round(wall, 6),
+        "events": sorted(rec.events, key=lambda e: e["t"]),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(cassette, f, indent=1)
+    kinds = defaultdict(int)
+    for ev in rec.events:
+        kinds[ev["kind"]] += 1
+    print(f"[record] {len(rec.events)} events ({', '.join(f'{k}={v}' for k, v in sorted(kinds.items()))}) "
+          f"in {wall:.3f}s, rc={rc} -> {args.output}", file=sys.stderr)
+    return rc
+
+
+def cmd_replay(args) -> int:
+    cassette = load_cassette(args.cassette)
+    res = replay_once(cassette, args.time_scale, args.quiet)
+    print(f"[replay] wall {res['wall_s']:.3f}s (recorded {cassette['wall_s']:.3f}s, scale {args.time_scale:g}), "
+          f"rc={res['rc']} (recorded {cassette['rc']}), events used={res['used']} unused={res['unused']} "
+          f"misses={len(res['misses'])}", file=sys.stderr)
+    for m in res["misses"][:20]:
+        print(f"[replay] miss: {m}", file=sys.stderr)
+    return 0 if res["rc"] == cassette["rc"] else 1
+
+
+def cmd_bench(args) -> int:
+    failed = False
+    for path in args.cassettes:
+        cassette = load_cassette(path)
+        walls = sorted(replay_once(cassette, args.time_scale, quiet=True)["wall_s"] * 1000 for _ in range(args.runs))
+        median = walls[len(walls) // 2]
+        verdict = ""
+        if args.max_ms is not None and median > args.max_ms:
+            verdict = f"  FAIL (> {args.max_ms:g}ms)"
+            failed = True
+        print(f"{os.path.basename(path)}: x{len(walls)} min={walls[0]:.1f}ms median={median:.1f}ms "
+              f"max={walls[-1]:.1f}ms (recorded {cassette['wall_s'] * 1000:.1f}ms){verdict}")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Record and replay log_my_ip.py runs")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("record", help="Run log_my_ip.py for real and write a cassette")
+    r.add_argument("-o", "--output", required=True, help="Cassette file to write")
+    r.add_argument("argv", nargs=argparse.REMAINDER, help="Arguments for log_my_ip.py (after --)")
+    p = sub.add_parser("replay", help="Replay a cassette once")
+    p.add_argument("cassette")
+    p.add_argument("--time-scale", type=float, default=1.0, help="Multiply recorded latencies (0 = no waiting)")
+    p.add_argument("-q", "--quiet", action="store_true", help="Hide log_my_ip.py output")
+    b = sub.add_parser("bench", help="Replay cassettes repeatedly and report wall time")
+    b.add_argument("cassettes", nargs="+")
+    b.add_argument("--runs", type=int, default=5)
+    b.add_argument("--time-scale", type=float, default=1.0, help="Multiply recorded latencies (0 = no waiting)")
+    b.add_argument("--max-ms", type=float, default=None, help="Fail if a cassette's median replay exceeds this")
+    args = ap.parse_args()
+    return {"record": cmd_record, "replay": cmd_replay, "bench": cmd_bench}[args.cmd](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
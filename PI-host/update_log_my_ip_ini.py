@@ -61,6 +61,7 @@ def build_missing_lines(existing: Dict[str, str]) -> list:
         "TGTOKEN": '""',
         "TGCHATID": '""',
         "TGGRPID": '""',
+        "TELEGRAM_API_URL": None,  # comment-only, default https://api.telegram.org
         "ENABLE_TELEGRAM": None,  # inferred if omitted
 
         # Discord
@@ -72,7 +73,37 @@ def build_missing_lines(existing: Dict[str, str]) -> list:
         "DISCORD_OS_LOGO_CODE": None,  # comment-only
         "DISCORD_THREAD_ID": None,     # comment-only
         "DISCORD_WAIT": None,          # comment-only
+        "DISCORD_EXTRA_WEBHOOK_URLS": None,  # comment-only
         "ENABLE_DISCORD": None,        # inferred if omitted
+        "STATUS_EDIT_IN_PLACE": None,  # default NO (Discord + Telegram)
+
+        # Other sinks (all optional)
+        "WEBHOOK_URL": None,
+        "WEBHOOK_AUTH_HEADER": None,
+        "ENABLE_WEBHOOK": None,        # inferred from WEBHOOK_URL
+        "ENABLE_SYSLOG": None,         # default NO
+        "SYSLOG_FACILITY": None,       # default USER
+        "JSONL_PATH": None,
+        "ENABLE_JSONL": None,          # inferred from JSONL_PATH
+        "SINK_TIMEOUT": None,          # default 30 seconds
+
+        # State and health
+        "STATE_DIR": None,             # default /var/lib/log-my-ip
+        "REPORT_HEALTH": None,         # default YES
+        "HEALTH_DISK_PATH": None,      # default /
+        "HEALTH_BUDGET_MS": None,      # used by bench_health.py, default 20
+
+        # DNS cache
+        "DNS_CACHE": None,             # default YES
+        "DNS_CACHE_TTL": None,         # default 3600 seconds
+        "DNS_CACHE_STALE": None,       # default 86400 seconds
+        "DNS_CACHE_NEGATIVE_TTL": None,  # default 60 seconds
+
+        # Scheduling
+        "SCHEDULE_JITTER_WINDOW": None,  # default 600 seconds
+        "SCHEDULE_INTERVAL": None,     # --daemon only, default 86400 seconds
+        "HTTP_RATE": None,             # default 2 requests/second, 0 disables
+        "HTTP_BURST": None,            # default 16 (covers a whole run)
     }
 
     lines: list = []